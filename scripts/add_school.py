@@ -13,11 +13,25 @@ import json
 import re
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    _HAVE_ORJSON = True
+except ModuleNotFoundError:
+    _HAVE_ORJSON = False
 
 GREEN = "\033[0;32m"
 RED = "\033[0;31m"
 NC = "\033[0m"
 
+# Regex to match the LAST hostname in a chain, compiled once per process.
+# Captures: (leading whitespace)(hostname === 'xxx')(tail like `) {` or `;` or `) return;`)
+_HOSTNAME_RE = re.compile(
+    r"^([ \t]*)(hostname === '[^']+')(.*?)$",
+    re.MULTILINE,
+)
+
 
 def ok(msg):
     print(f"  {GREEN}✓{NC} {msg}")
@@ -29,24 +43,33 @@ def fail(msg):
 
 # ─── manifest.json ───────────────────────────────────────────
 
-def update_manifest(filepath, domain):
-    with open(filepath, "r") as f:
-        data = json.load(f)
-
+def update_manifest(data, filepath, domain):
     pattern = f"*://{domain}/*"
+    mutated = False
 
     # host_permissions
     if pattern not in data.get("host_permissions", []):
         data["host_permissions"].append(pattern)
+        mutated = True
 
     # content_scripts[].matches
     for cs in data.get("content_scripts", []):
         if pattern not in cs.get("matches", []):
             cs["matches"].append(pattern)
-
-    with open(filepath, "w") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
+            mutated = True
+
+    # Only rewrite (and touch the mtime) when something actually changed
+    if mutated:
+        if _HAVE_ORJSON:
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(
+                    data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+                ))
+        else:
+            with open(filepath, "w") as f:
+                json.dump(data, f, indent=2)
+                f.write("\n")
 
     ok("manifest.json — host_permissions + content_scripts")
 
@@ -57,67 +80,65 @@ def update_manifest(filepath, domain):
 # block and append `||\n<indent>hostname === '<new>'` with the
 # same trailing token (`;`, `) {`, `) return;`, etc.).
 
-def add_domain_to_js(filepath, domain):
+def make_inserter(domain):
     """
-    Scans the file for lines matching:
+    Builds a function that scans a file for lines matching:
         hostname === '<something>'<tail>
     where <tail> ends the chain (e.g. `;`, `) {`, `) return;`).
     For each such line, it inserts a new `hostname === '<domain>'`
     line with the same indent and tail.
+
+    The domain literal is formatted once here, so the three per-file
+    calls share it instead of rebuilding it in the hot replacement path.
     """
-    with open(filepath, "r") as f:
-        lines = f.readlines()
+    domain_quoted = f"'{domain}'"
+    new_check = f"hostname === {domain_quoted}"
 
-    # Regex to match the LAST hostname in a chain
-    # Captures: (leading whitespace)(hostname === 'xxx')(tail like `) {` or `;` or `) return;`)
-    pattern = re.compile(
-        r"^(\s*)(hostname === '[^']+')(.*?)$"
-    )
+    def add_domain_to_js(filepath):
+        with open(filepath, "rb") as f:
+            raw = f.read()
 
-    new_lines = []
-    changes = 0
+        # Fast path: files without any hostname check are rejected on the raw
+        # bytes and never pay for a UTF-8 decode or a regex pass.
+        if b"hostname ===" not in raw:
+            return 0
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        m = pattern.match(line)
+        text = raw.decode("utf-8")
+        changes = 0
 
-        if m:
+        def repl(m):
+            nonlocal changes
+            line = m.group(0)
             indent = m.group(1)
-            _match_part = m.group(2)  # e.g. hostname === 'canvas.asu.edu'
-            tail = m.group(3)         # e.g. `) {` or `;` or `) return;`
+            match_part = m.group(2)  # e.g. hostname === 'canvas.asu.edu'
+            tail = m.group(3)        # e.g. `) {` or `;` or `) return;`
+
+            # Check if domain is already present on this line
+            if domain_quoted in line:
+                return line
 
             # Only modify if this is the END of a chain
             # (i.e. tail is not just ` ||`)
             tail_stripped = tail.strip()
-
-            # Check if domain is already present anywhere in the file near here
-            if f"'{domain}'" in line:
-                new_lines.append(line)
-                i += 1
-                continue
-
             if tail_stripped and tail_stripped != "||":
                 # This is the last hostname line in a chain.
                 # Convert it to continue the chain, then add our new domain.
                 # current line becomes: <indent><match_part> ||
                 # new line becomes:     <indent>hostname === '<domain>'<tail>
-                new_current = f"{indent}{_match_part} ||\n"
-                new_entry = f"{indent}hostname === '{domain}'{tail}\n"
-                new_lines.append(new_current)
-                new_lines.append(new_entry)
                 changes += 1
-                i += 1
-                continue
+                return f"{indent}{match_part} ||\n{indent}{new_check}{tail}"
+
+            return line
+
+        new_text = _HOSTNAME_RE.sub(repl, text)
 
-        new_lines.append(line)
-        i += 1
+        if changes > 0:
+            with open(filepath, "w") as f:
+                f.write(new_text)
 
-    if changes > 0:
-        with open(filepath, "w") as f:
-            f.writelines(new_lines)
+        return changes
 
-    return changes
+    return add_domain_to_js
 
 
 def main():
@@ -128,36 +149,52 @@ def main():
     project_dir = sys.argv[1]
     domain = sys.argv[2].lower()
 
-    manifest = os.path.join(project_dir, "manifest.json")
-    content_js = os.path.join(project_dir, "content.js")
-    background_js = os.path.join(project_dir, "background.js")
-    popup_js = os.path.join(project_dir, "popup.js")
+    # Check files exist — one directory read instead of four stat calls
+    need = {"manifest.json", "content.js", "background.js", "popup.js"}
+    try:
+        with os.scandir(project_dir) as entries:
+            found = {
+                entry.name: entry.path
+                for entry in entries
+                if entry.name in need and entry.is_file()
+            }
+    except OSError:
+        fail(f"Cannot read directory: {project_dir}")
+        sys.exit(1)
 
-    # Check files exist
-    for f in [manifest, content_js, background_js, popup_js]:
-        if not os.path.isfile(f):
-            fail(f"File not found: {f}")
-            sys.exit(1)
+    missing = need - found.keys()
+    if missing:
+        for name in sorted(missing):
+            fail(f"File not found: {os.path.join(project_dir, name)}")
+        sys.exit(1)
 
-    # Check if domain already exists
-    with open(manifest, "r") as f:
-        if domain in f.read():
-            sys.exit(2)  # Already exists
+    manifest = found["manifest.json"]
+    content_js = found["content.js"]
+    background_js = found["background.js"]
+    popup_js = found["popup.js"]
 
-    # 1. manifest.json
-    update_manifest(manifest, domain)
-
-    # 2. content.js
-    n = add_domain_to_js(content_js, domain)
-    ok(f"content.js — {n} domain check(s) updated")
+    # Read and parse the manifest once; reuse the parsed data for both
+    # the already-exists check and the update.
+    with open(manifest, "r") as f:
+        manifest_data = json.load(f)
 
-    # 3. background.js
-    n = add_domain_to_js(background_js, domain)
-    ok(f"background.js — {n} domain check(s) updated")
+    # Check if domain already exists
+    if f"*://{domain}/*" in manifest_data.get("host_permissions", []):
+        sys.exit(2)  # Already exists
 
-    # 4. popup.js
-    n = add_domain_to_js(popup_js, domain)
-    ok(f"popup.js — {n} domain check(s) updated")
+    # 1. manifest.json
+    update_manifest(manifest_data, manifest, domain)
+
+    add_domain_to_js = make_inserter(domain)
+
+    # 2-4. content.js / background.js / popup.js
+    # The three files are disjoint, so their read → regex → write work
+    # can overlap in a small thread pool.
+    js_files = [content_js, background_js, popup_js]
+    with ThreadPoolExecutor(max_workers=len(js_files)) as pool:
+        counts = pool.map(add_domain_to_js, js_files)
+    for path, n in zip(js_files, counts):
+        ok(f"{os.path.basename(path)} — {n} domain check(s) updated")
 
 
 if __name__ == "__main__":
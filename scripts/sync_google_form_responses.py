@@ -17,6 +17,8 @@ import json
 import os
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
+from textwrap import indent
 
 try:
     from google.oauth2.service_account import Credentials
@@ -29,6 +31,12 @@ except ModuleNotFoundError:
     )
     sys.exit(1)
 
+try:
+    import orjson
+    _HAVE_ORJSON = True
+except ModuleNotFoundError:
+    _HAVE_ORJSON = False
+
 
 DEFAULT_RANGE = "Form Responses 1!A:Z"
 DEFAULT_OUTPUT = "docs/bug-reports/google-form-responses.json"
@@ -48,9 +56,13 @@ def get_required_env(name: str) -> str:
 
 
 def parse_service_account_info(raw_key: str) -> dict:
+    # Both orjson.JSONDecodeError and json.JSONDecodeError subclass
+    # ValueError, so one except clause covers either parser.
     try:
+        if _HAVE_ORJSON:
+            return orjson.loads(raw_key)
         return json.loads(raw_key)
-    except json.JSONDecodeError as exc:
+    except ValueError as exc:
         die(
             "GOOGLE_SERVICE_ACCOUNT_KEY is not valid JSON. "
             f"Original error: {exc}"
@@ -70,38 +82,98 @@ def to_unique_headers(header_row: list[str]) -> list[str]:
     return headers
 
 
-def parse_excluded_headers(raw_exclusions: str) -> set[str]:
+def parse_excluded_headers(raw_exclusions: str) -> frozenset[str]:
     if not raw_exclusions.strip():
-        return set()
-    return {part.strip().lower() for part in raw_exclusions.split(",") if part.strip()}
+        return frozenset()
+    return frozenset(
+        part.strip().lower() for part in raw_exclusions.split(",") if part.strip()
+    )
 
 
-def row_to_record(
-    row: list[str],
-    headers: list[str],
-    excluded_headers: set[str],
-) -> dict:
-    record: dict[str, str] = {}
+def kept_columns(headers: list[str], excluded_headers: frozenset[str]) -> list[tuple[int, str]]:
+    return [
+        (idx, header)
+        for idx, header in enumerate(headers)
+        if header.lower() not in excluded_headers
+    ]
 
-    for idx, header in enumerate(headers):
-        if header.lower() in excluded_headers:
-            continue
-        value = row[idx] if idx < len(row) else ""
-        record[header] = value
 
-    return record
+def row_to_record(row: list[str], kept: list[tuple[int, str]], width: int) -> dict:
+    # Pad short rows once so the dict build is plain indexing, with no
+    # per-cell bounds check.
+    if len(row) < width:
+        row = row + [""] * (width - len(row))
+    return {header: row[idx] for idx, header in kept}
 
 
-def fetch_sheet_values(spreadsheet_id: str, sheet_range: str, service_account_info: dict) -> list[list[str]]:
+def write_payload(output_path: str, head: dict, records: list[dict]) -> None:
+    """Write the JSON payload, streaming records one at a time.
+
+    The envelope is serialized separately from the records so peak memory
+    stays at roughly one record rather than a second copy of the whole
+    payload. The file is written to a sibling .tmp path and renamed into
+    place, so readers never observe a truncated payload.
+    """
+    if _HAVE_ORJSON:
+        def dump_record(record: dict) -> str:
+            return orjson.dumps(record, option=orjson.OPT_INDENT_2).decode()
+    else:
+        def dump_record(record: dict) -> str:
+            return json.dumps(record, indent=2, ensure_ascii=False)
+
+    head_text = json.dumps(head, indent=2, ensure_ascii=False)
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write(head_text[: -len("\n}")] + ',\n  "records": [')
+        separator = "\n"
+        for record in records:
+            out.write(separator + indent(dump_record(record), "    "))
+            separator = ",\n"
+        out.write(("\n  " if records else "") + "]\n}\n")
+    os.replace(tmp_path, output_path)
+
+
+@lru_cache(maxsize=4)
+def _get_service(frozen_info: tuple, scopes: tuple):
+    """Build (and memoize) a Sheets client for the given key and scopes.
+
+    Credentials construction parses the PEM private key and sets up a JWT
+    signer; caching amortizes that across repeated main() calls in one
+    process. The arguments are hashable snapshots of the key dict and
+    scope list.
+    """
     credentials = Credentials.from_service_account_info(
-        service_account_info,
-        scopes=SHEETS_READONLY_SCOPE,
+        dict(frozen_info),
+        scopes=list(scopes),
     )
-    service = build("sheets", "v4", credentials=credentials)
+    # static_discovery uses the discovery document bundled with
+    # googleapiclient instead of fetching it over HTTPS on every run.
+    return build(
+        "sheets",
+        "v4",
+        credentials=credentials,
+        static_discovery=True,
+        cache_discovery=False,
+    )
+
+
+def fetch_sheet_values(spreadsheet_id: str, sheet_range: str, service_account_info: dict) -> list[list[str]]:
+    service = _get_service(
+        tuple(sorted(service_account_info.items())),
+        tuple(SHEETS_READONLY_SCOPE),
+    )
+    # fields="values" asks the API for a partial response: the range and
+    # majorDimension echo fields are dropped from the payload we download.
     response = (
         service.spreadsheets()
         .values()
-        .get(spreadsheetId=spreadsheet_id, range=sheet_range)
+        .get(
+            spreadsheetId=spreadsheet_id,
+            range=sheet_range,
+            majorDimension="ROWS",
+            fields="values",
+        )
         .execute()
     )
     return response.get("values", [])
@@ -129,30 +201,30 @@ def main() -> None:
     values = fetch_sheet_values(spreadsheet_id, sheet_range, service_account_info)
 
     if not values:
-        headers = []
+        kept = []
         records = []
     else:
         headers = to_unique_headers(values[0])
+        # Resolve the case-folded exclusions against the actual headers
+        # once, rather than lowercasing every header for every row.
+        kept = kept_columns(headers, excluded_headers)
         rows = values[1:]
         if max_rows is not None:
             rows = rows[-max_rows:]
-        records = [row_to_record(row, headers, excluded_headers) for row in rows]
+        records = [row_to_record(row, kept, len(headers)) for row in rows]
 
-    payload = {
+    head = {
         "synced_at_utc": datetime.now(timezone.utc).isoformat(),
         "spreadsheet_id": spreadsheet_id,
         "range": sheet_range,
         "excluded_columns": sorted(list(excluded_headers)),
         "total_records": len(records),
-        "headers": [h for h in headers if h.lower() not in excluded_headers],
-        "records": records,
+        "headers": [header for _, header in kept],
     }
 
     output_dir = os.path.dirname(output_path) or "."
     os.makedirs(output_dir, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as out:
-        json.dump(payload, out, indent=2, ensure_ascii=False)
-        out.write("\n")
+    write_payload(output_path, head, records)
 
     print(f"Wrote {len(records)} records to {output_path}")
 